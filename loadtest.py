@@ -0,0 +1,431 @@
+"""
+Load test for the news-sentiment API against a local upstream simulator.
+
+Starts a stand-in server for Google/Bing/Yahoo RSS, the Yahoo search/quote
+JSON API (used instead of yfinance/yahooquery) and an Azure OpenAI
+chat-completions endpoint, boots the app pointed at it, then drives
+concurrent traffic and reports throughput and p50/p95/p99 latency per endpoint.
+
+    python loadtest.py run --concurrency 32 --duration 30 --latency-ms 150
+    python loadtest.py run --target http://127.0.0.1:8000 --upstream http://127.0.0.1:9100
+    python loadtest.py sim --port 9100 --error-rate 0.05
+"""
+import os
+import sys
+import json
+import math
+import time
+import random
+import socket
+import argparse
+import threading
+import subprocess
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Dict, Any, List
+from urllib.parse import urlparse, parse_qs
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+ENDPOINTS = ("news", "news-agent")
+COMPANIES = ["NVDA", "Apple", "MSFT", "Royal Bank of Canada", "SHOP.TO", "Tesla"]
+WORDS = [
+    "stock", "surges", "falls", "record", "earnings", "beat", "miss", "guidance", "strong",
+    "weak", "analysts", "upgrade", "downgrade", "rally", "slump", "growth", "lawsuit", "deal",
+]
+
+
+# --- upstream simulator ---
+
+class SimConfig:
+    def __init__(self, latency_ms: float = 100.0, jitter_ms: float = 25.0, error_rate: float = 0.0,
+                 feed_items: int = 20, body_bytes: int = 200):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.feed_items = feed_items
+        self.body_bytes = body_bytes
+
+
+def sim_symbol(q: str) -> str:
+    q = q.strip()
+    if q.upper() == q and " " not in q:
+        return q.upper()
+    return "".join(w[0] for w in q.split()).upper()[:4] or "SIM"
+
+
+def sim_headline(rng: random.Random, symbol: str) -> str:
+    return f"{symbol} " + " ".join(rng.choice(WORDS) for _ in range(8))
+
+
+def sim_rss(cfg: SimConfig, symbol: str) -> bytes:
+    rng = random.Random()
+    now = time.time()
+    pad = "x" * cfg.body_bytes
+    entries = []
+    for i in range(cfg.feed_items):
+        entries.append(
+            "<item>"
+            f"<title>{sim_headline(rng, symbol)}</title>"
+            f"<link>http://sim.local/{symbol}/{i}-{rng.getrandbits(32)}</link>"
+            f"<pubDate>{formatdate(now - i * 600)}</pubDate>"
+            "<source url=\"http://sim.local\">Sim Wire</source>"
+            f"<description>{pad}</description>"
+            "</item>"
+        )
+    return (
+        "<?xml version=\"1.0\" encoding=\"UTF-8\"?>"
+        f"<rss version=\"2.0\"><channel><title>{symbol}</title>{''.join(entries)}</channel></rss>"
+    ).encode()
+
+
+def sim_search(cfg: SimConfig, q: str, news_count: int) -> Dict[str, Any]:
+    rng = random.Random()
+    symbol = sim_symbol(q)
+    now = int(time.time())
+    return {
+        "quotes": [{"symbol": symbol, "quoteType": "EQUITY", "shortname": q.title(), "longname": f"{q.title()} Inc."}],
+        "news": [{
+            "title": sim_headline(rng, symbol),
+            "link": f"http://sim.local/{symbol}/n{i}",
+            "publisher": "Sim Wire",
+            "providerPublishTime": now - i * 600,
+        } for i in range(news_count)],
+    }
+
+
+def sim_quote(symbols: str) -> Dict[str, Any]:
+    return {"quoteResponse": {"result": [
+        {"symbol": s, "shortName": f"{s} Corp", "longName": f"{s} Corporation"}
+        for s in symbols.split(",") if s
+    ]}}
+
+
+def sim_chat_completion(deployment: str) -> Dict[str, Any]:
+    content = json.dumps({"company": random.choice(COMPANIES), "items": random.choice([5, 10, 20])},
+                         separators=(",", ":"))
+    return {
+        "id": f"chatcmpl-sim{random.getrandbits(32):x}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": deployment,
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": 300, "completion_tokens": 12, "total_tokens": 312},
+    }
+
+
+def make_sim_handler(cfg: SimConfig):
+    class SimHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def send_body(self, status: int, body: bytes, content_type: str):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def send_json(self, obj: Dict[str, Any]):
+            self.send_body(200, json.dumps(obj).encode(), "application/json")
+
+        def simulate_upstream(self) -> bool:
+            delay = cfg.latency_ms + random.uniform(-cfg.jitter_ms, cfg.jitter_ms)
+            if delay > 0:
+                time.sleep(delay / 1000)
+            if random.random() < cfg.error_rate:
+                self.send_body(503, b"simulated upstream error", "text/plain")
+                return False
+            return True
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            qs = {k: v[0] for k, v in parse_qs(url.query).items()}
+            if url.path == "/health":
+                return self.send_body(200, b"ok", "text/plain")
+            if not self.simulate_upstream():
+                return
+            if url.path in {"/google/rss/search", "/bing/news/search"}:
+                return self.send_body(200, sim_rss(cfg, sim_symbol(qs.get("q", "SIM").split(" OR ")[0])),
+                                      "application/rss+xml")
+            if url.path == "/yahoo/rss/2.0/headline":
+                return self.send_body(200, sim_rss(cfg, qs.get("s", "SIM")), "application/rss+xml")
+            if url.path == "/yahoo/v1/finance/search":
+                return self.send_json(sim_search(cfg, qs.get("q", "SIM"), int(qs.get("newsCount", 0))))
+            if url.path == "/yahoo/v7/finance/quote":
+                return self.send_json(sim_quote(qs.get("symbols", "")))
+            self.send_body(404, b"not found", "text/plain")
+
+        def do_POST(self):
+            url = urlparse(self.path)
+            self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            parts = url.path.strip("/").split("/")
+            # /openai/deployments/<deployment>/chat/completions
+            if len(parts) != 5 or parts[:2] != ["openai", "deployments"] or parts[3:] != ["chat", "completions"]:
+                return self.send_body(404, b"not found", "text/plain")
+            if not self.simulate_upstream():
+                return
+            self.send_json(sim_chat_completion(parts[2]))
+
+    return SimHandler
+
+
+def run_sim(cfg: SimConfig, host: str, port: int):
+    server = ThreadingHTTPServer((host, port), make_sim_handler(cfg))
+    server.daemon_threads = True
+    print(f"Upstream simulator on http://{host}:{port} "
+          f"(latency {cfg.latency_ms}±{cfg.jitter_ms}ms, error rate {cfg.error_rate}, "
+          f"{cfg.feed_items} items/feed)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def upstream_env(upstream: str) -> Dict[str, str]:
+    return {
+        "GOOGLE_NEWS_RSS_URL": f"{upstream}/google/rss/search",
+        "BING_NEWS_RSS_URL": f"{upstream}/bing/news/search",
+        "YAHOO_RSS_URL": f"{upstream}/yahoo/rss/2.0/headline",
+        "YAHOO_API_URL": f"{upstream}/yahoo",
+        "AZURE_OPENAI_ENDPOINT": upstream,
+        "AZURE_OPENAI_DEPLOYMENT": "sim-chat",
+        "AZURE_OPENAI_DEPLOYMENT2": "sim-chat-2",
+        "AZURE_OPENAI_API_KEY": "loadtest",
+        "NO_PROXY": "127.0.0.1,localhost",
+    }
+
+
+# --- load driver ---
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_ready(url: str, proc: Optional[subprocess.Popen], timeout: float = 60.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if proc is not None and proc.poll() is not None:
+            raise RuntimeError(f"process exited with code {proc.returncode} before {url} came up")
+        try:
+            if requests.get(url, timeout=1).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.25)
+    raise RuntimeError(f"timed out waiting for {url}")
+
+
+def request_payload(endpoint: str, rng: random.Random) -> Dict[str, Any]:
+    company = rng.choice(COMPANIES)
+    items = rng.choice([5, 10, 20])
+    if endpoint == "news":
+        return {"company": company, "items": items}
+    return {"prompt": f"Give me the top {items} headlines for {company}"}
+
+
+def percentile(sorted_vals: List[float], pct: float) -> float:
+    if not sorted_vals:
+        return 0.0
+    k = max(0, min(len(sorted_vals) - 1, math.ceil(pct / 100 * len(sorted_vals)) - 1))
+    return sorted_vals[k]
+
+
+def drive(target: str, endpoint: str, concurrency: int, duration: float, timeout: float) -> Dict[str, Any]:
+    url = f"{target}/api/{endpoint}"
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + duration
+
+    def worker(seed: int):
+        rng = random.Random(seed)
+        session = requests.Session()
+        local_lat: List[float] = []
+        local_status: Dict[str, int] = {}
+        while time.perf_counter() < stop_at:
+            t0 = time.perf_counter()
+            try:
+                status = str(session.post(url, json=request_payload(endpoint, rng), timeout=timeout).status_code)
+            except requests.Timeout:
+                status = "timeout"
+            except requests.RequestException:
+                status = "conn_error"
+            local_lat.append((time.perf_counter() - t0) * 1000)
+            local_status[status] = local_status.get(status, 0) + 1
+        session.close()
+        with lock:
+            latencies.extend(local_lat)
+            for k, v in local_status.items():
+                statuses[k] = statuses.get(k, 0) + v
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(worker, range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    total = len(latencies)
+    ok = statuses.get("200", 0)
+    return {
+        "endpoint": f"/api/{endpoint}",
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 2),
+        "requests": total,
+        "ok": ok,
+        "statuses": statuses,
+        "rps": round(total / elapsed, 2) if elapsed else 0.0,
+        "ok_rps": round(ok / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 1),
+        "p95_ms": round(percentile(latencies, 95), 1),
+        "p99_ms": round(percentile(latencies, 99), 1),
+        "max_ms": round(latencies[-1], 1) if latencies else 0.0,
+    }
+
+
+def print_report(results: List[Dict[str, Any]]):
+    print("")
+    print("=== Load Test Results ===")
+    print(f"{'endpoint':<18}{'conc':>6}{'reqs':>8}{'ok':>8}{'rps':>9}{'ok_rps':>9}"
+          f"{'p50ms':>9}{'p95ms':>9}{'p99ms':>9}{'maxms':>9}  statuses")
+    for r in results:
+        statuses = " ".join(f"{k}:{v}" for k, v in sorted(r["statuses"].items()))
+        print(f"{r['endpoint']:<18}{r['concurrency']:>6}{r['requests']:>8}{r['ok']:>8}{r['rps']:>9.2f}"
+              f"{r['ok_rps']:>9.2f}{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}{r['p99_ms']:>9.1f}{r['max_ms']:>9.1f}"
+              f"  {statuses}")
+    print("")
+
+
+def check_thresholds(results: List[Dict[str, Any]], args) -> List[str]:
+    failures = []
+    for r in results:
+        if args.min_rps is not None and r["ok_rps"] < args.min_rps:
+            failures.append(f"{r['endpoint']}: ok_rps {r['ok_rps']} < {args.min_rps}")
+        if args.max_p95_ms is not None and r["p95_ms"] > args.max_p95_ms:
+            failures.append(f"{r['endpoint']}: p95 {r['p95_ms']}ms > {args.max_p95_ms}ms")
+        if args.max_p99_ms is not None and r["p99_ms"] > args.max_p99_ms:
+            failures.append(f"{r['endpoint']}: p99 {r['p99_ms']}ms > {args.max_p99_ms}ms")
+    return failures
+
+
+def stop(proc: Optional[subprocess.Popen]):
+    if proc is None or proc.poll() is not None:
+        return
+    proc.terminate()
+    try:
+        proc.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+
+
+def run_load(args) -> int:
+    here = os.path.dirname(os.path.abspath(__file__))
+    sim_proc: Optional[subprocess.Popen] = None
+    app_proc: Optional[subprocess.Popen] = None
+    try:
+        upstream = args.upstream
+        if not upstream and not args.target:
+            sim_port = free_port()
+            upstream = f"http://127.0.0.1:{sim_port}"
+            sim_proc = subprocess.Popen([
+                sys.executable, os.path.join(here, "loadtest.py"), "sim",
+                "--host", "127.0.0.1", "--port", str(sim_port),
+                "--latency-ms", str(args.latency_ms), "--jitter-ms", str(args.jitter_ms),
+                "--error-rate", str(args.error_rate), "--feed-items", str(args.feed_items),
+                "--body-bytes", str(args.body_bytes),
+            ])
+            wait_ready(f"{upstream}/health", sim_proc)
+
+        target = args.target
+        if not target:
+            app_port = free_port()
+            target = f"http://127.0.0.1:{app_port}"
+            env = {**os.environ, **upstream_env(upstream)}
+            app_proc = subprocess.Popen(
+                [sys.executable, "-m", "uvicorn", "app:app", "--host", "127.0.0.1", "--port", str(app_port),
+                 "--workers", str(args.workers), "--log-level", "warning"],
+                cwd=here, env=env,
+                stdout=None if args.app_log else subprocess.DEVNULL,
+                stderr=None if args.app_log else subprocess.DEVNULL,
+            )
+            wait_ready(f"{target}/openapi.json", app_proc)
+
+        print(f"Target: {target}   Upstream: {upstream or 'external'}")
+        results = []
+        for endpoint in args.endpoint or list(ENDPOINTS):
+            if args.warmup > 0:
+                drive(target, endpoint, args.concurrency, args.warmup, args.timeout)
+            print(f"Driving /api/{endpoint} with {args.concurrency} workers for {args.duration}s...", flush=True)
+            results.append(drive(target, endpoint, args.concurrency, args.duration, args.timeout))
+    finally:
+        stop(app_proc)
+        stop(sim_proc)
+
+    print_report(results)
+    if args.json_out:
+        with open(args.json_out, "w") as f:
+            json.dump(results, f, indent=2)
+
+    failures = check_thresholds(results, args)
+    for msg in failures:
+        print(f"FAIL {msg}")
+    return 1 if failures else 0
+
+
+def add_sim_args(p: argparse.ArgumentParser):
+    p.add_argument("--latency-ms", type=float, default=100.0, help="mean upstream latency per call")
+    p.add_argument("--jitter-ms", type=float, default=25.0, help="uniform +/- jitter on upstream latency")
+    p.add_argument("--error-rate", type=float, default=0.0, help="fraction of upstream calls answered with 503")
+    p.add_argument("--feed-items", type=int, default=20, help="entries per RSS feed")
+    p.add_argument("--body-bytes", type=int, default=200, help="description padding per RSS entry")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the news-sentiment API against a simulated upstream.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    sim = sub.add_parser("sim", help="run only the upstream simulator")
+    sim.add_argument("--host", default="127.0.0.1")
+    sim.add_argument("--port", type=int, default=9100)
+    add_sim_args(sim)
+
+    run = sub.add_parser("run", help="start simulator + app and drive load")
+    run.add_argument("--endpoint", action="append", choices=ENDPOINTS,
+                     help="endpoint to drive (repeatable, default: all)")
+    run.add_argument("--concurrency", type=int, default=16)
+    run.add_argument("--duration", type=float, default=20.0, help="seconds per endpoint")
+    run.add_argument("--warmup", type=float, default=2.0, help="unmeasured seconds before each endpoint")
+    run.add_argument("--timeout", type=float, default=60.0, help="per-request client timeout")
+    run.add_argument("--workers", type=int, default=1, help="uvicorn workers for the app")
+    run.add_argument("--target", help="use an already running app instead of starting one")
+    run.add_argument("--upstream", help="use an already running simulator instead of starting one")
+    run.add_argument("--app-log", action="store_true", help="show app stdout/stderr")
+    run.add_argument("--json-out", help="write results as JSON to this path")
+    run.add_argument("--min-rps", type=float, help="fail if any endpoint's ok_rps is below this")
+    run.add_argument("--max-p95-ms", type=float, help="fail if any endpoint's p95 exceeds this")
+    run.add_argument("--max-p99-ms", type=float, help="fail if any endpoint's p99 exceeds this")
+    add_sim_args(run)
+
+    args = parser.parse_args()
+    if args.cmd == "sim":
+        run_sim(SimConfig(args.latency_ms, args.jitter_ms, args.error_rate, args.feed_items, args.body_bytes),
+                args.host, args.port)
+        return 0
+    return run_load(args)
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except KeyboardInterrupt:
+        sys.exit(130)
+    except Exception as e:
+        print(f"Fatal error: {e}", file=sys.stderr)
+        sys.exit(1)
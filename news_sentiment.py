@@ -1,3 +1,4 @@
+import os
 import sys
 import re
 import time
@@ -33,6 +34,13 @@ UA = (
 )
 HTTP_TIMEOUT = 10
 
+# Upstream endpoints; overridable so loadtest.py can point the app at its simulator
+GOOGLE_NEWS_RSS_URL = os.environ.get("GOOGLE_NEWS_RSS_URL", "https://news.google.com/rss/search")
+BING_NEWS_RSS_URL = os.environ.get("BING_NEWS_RSS_URL", "https://www.bing.com/news/search")
+YAHOO_RSS_URL = os.environ.get("YAHOO_RSS_URL", "https://feeds.finance.yahoo.com/rss/2.0/headline")
+# When set, symbol/name lookups and yf news go to this Yahoo-style JSON API instead of yfinance/yahooquery
+YAHOO_API_URL = os.environ.get("YAHOO_API_URL", "").rstrip("/")
+
 # Tight ticker check so "nvidia" is treated as a name, not a ticker
 TICKER_RE = re.compile(r"^[A-Z0-9]{1,6}([.\-][A-Z0-9]{1,4})?$")
 
@@ -45,6 +53,10 @@ def resolve_symbol_and_name(query: str) -> Tuple[str, Optional[str]]:
     q = query.strip()
 
     def yf_name(sym: str) -> Optional[str]:
+        if YAHOO_API_URL:
+            data = fetch_json(f"{YAHOO_API_URL}/v7/finance/quote", {"symbols": sym}) or {}
+            results = (data.get("quoteResponse") or {}).get("result") or [{}]
+            return results[0].get("shortName") or results[0].get("longName")
         try:
             t = yf.Ticker(sym)
             # get_info is flaky sometimes; try both
@@ -67,9 +79,12 @@ def resolve_symbol_and_name(query: str) -> Tuple[str, Optional[str]]:
         name = yf_name(sym)
         return sym, name
 
-    if HAVE_YQ:
+    if HAVE_YQ or YAHOO_API_URL:
         try:
-            res = yq_search(q)
+            if YAHOO_API_URL:
+                res = fetch_json(f"{YAHOO_API_URL}/v1/finance/search", {"q": q})
+            else:
+                res = yq_search(q)
             quotes = res.get("quotes", []) if isinstance(res, dict) else []
             # Prefer equities; otherwise take the first thing with a symbol
             equities = [it for it in quotes if str(it.get("quoteType", "")).upper() == "EQUITY"]
@@ -94,6 +109,17 @@ def fetch_url(url: str) -> Optional[bytes]:
     return None
 
 
+def fetch_json(url: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    try:
+        r = requests.get(url, params=params, headers={"User-Agent": UA}, timeout=HTTP_TIMEOUT)
+        if r.status_code == 200:
+            data = r.json()
+            return data if isinstance(data, dict) else None
+    except Exception:
+        pass
+    return None
+
+
 def rss_google_news(symbol: str, company_name: Optional[str]) -> List[Dict[str, Any]]:
     q_parts = [symbol]
     if company_name:
@@ -103,7 +129,7 @@ def rss_google_news(symbol: str, company_name: Optional[str]) -> List[Dict[str,
             f"{company_name} ticker"
         ])
     q = " OR ".join(q_parts)
-    url = f"https://news.google.com/rss/search?q={quote_plus(q)}&hl=en-US&gl=US&ceid=US:en"
+    url = f"{GOOGLE_NEWS_RSS_URL}?q={quote_plus(q)}&hl=en-US&gl=US&ceid=US:en"
     content = fetch_url(url)
     items: List[Dict[str, Any]] = []
     if not content:
@@ -128,7 +154,7 @@ def rss_google_news(symbol: str, company_name: Optional[str]) -> List[Dict[str,
 
 def rss_bing_news(symbol: str, company_name: Optional[str]) -> List[Dict[str, Any]]:
     q = f"{symbol} {company_name or ''}".strip()
-    url = f"https://www.bing.com/news/search?q={quote_plus(q)}&format=RSS"
+    url = f"{BING_NEWS_RSS_URL}?q={quote_plus(q)}&format=RSS"
     content = fetch_url(url)
     items: List[Dict[str, Any]] = []
     if not content:
@@ -152,8 +178,8 @@ def rss_bing_news(symbol: str, company_name: Optional[str]) -> List[Dict[str, An
 
 def rss_yahoo_finance(symbol: str) -> List[Dict[str, Any]]:
     urls = [
-        f"https://feeds.finance.yahoo.com/rss/2.0/headline?s={quote_plus(symbol)}&lang=en-US",
-        f"https://feeds.finance.yahoo.com/rss/2.0/headline?s={quote_plus(symbol)}&region=US&lang=en-US",
+        f"{YAHOO_RSS_URL}?s={quote_plus(symbol)}&lang=en-US",
+        f"{YAHOO_RSS_URL}?s={quote_plus(symbol)}&region=US&lang=en-US",
     ]
     items: List[Dict[str, Any]] = []
     for url in urls:
@@ -182,8 +208,10 @@ def rss_yahoo_finance(symbol: str) -> List[Dict[str, Any]]:
 def yf_property_news(symbol: str) -> List[Dict[str, Any]]:
     items: List[Dict[str, Any]] = []
     try:
-        t = yf.Ticker(symbol)
-        raw = t.news or []
+        if YAHOO_API_URL:
+            raw = (fetch_json(f"{YAHOO_API_URL}/v1/finance/search", {"q": symbol, "newsCount": 20}) or {}).get("news") or []
+        else:
+            raw = yf.Ticker(symbol).news or []
         for it in raw:
             title = it.get("title") or it.get("headline")
             link = it.get("link") or it.get("url")